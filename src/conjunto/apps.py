@@ -1,4 +1,6 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_delete
 
 
 class ConjuntoConfig(AppConfig):
@@ -7,3 +9,12 @@ class ConjuntoConfig(AppConfig):
 
     def ready(self):
         from . import components  # noqa
+        from .middleware import clear_settings_cache
+
+        settings_model = getattr(settings, "SETTINGS_MODEL", None)
+        if settings_model:
+            post_delete.connect(
+                clear_settings_cache,
+                sender=settings_model,
+                dispatch_uid="conjunto_clear_settings_cache",
+            )
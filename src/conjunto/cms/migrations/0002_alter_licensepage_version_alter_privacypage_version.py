@@ -0,0 +1,23 @@
+# Generated by Django 4.2.8 on 2026-10-16 12:00
+
+from django.db import migrations
+import versionfield.fields
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("cms", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="licensepage",
+            name="version",
+            field=versionfield.fields.VersionField(db_index=True, default="1.0.0"),
+        ),
+        migrations.AlterField(
+            model_name="privacypage",
+            name="version",
+            field=versionfield.fields.VersionField(db_index=True, default="1.0.0"),
+        ),
+    ]
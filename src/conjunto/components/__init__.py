@@ -1,4 +1,8 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
 from django.core.exceptions import FieldDoesNotExist
+from django.db.models import QuerySet
 from django.utils.text import capfirst
 from django_web_components import component
 from django.utils.translation import gettext_lazy as _
@@ -78,15 +82,22 @@ class List(component.Component):
     """A flexible component to display a Tabler.io list.
 
     Attributes:
-        items: the list of objects to display. Should be a queryset.
+        items: the list of objects to display. Should be a queryset or another
+            sequence. Other iterables (e.g. generators) are materialized once.
         hoverable: whether the list items are hoverable or not.
     """
 
     template_name = "conjunto/components/list.html"
 
-    def get_context_data(self, items: list, hoverable: bool = False):
+    def get_context_data(
+        self, items: Sequence[Any] | Iterable[Any] = (), hoverable: bool = False
+    ):
         # TODO: should "items" be renamed into "queryset"
-        return {"items": "items", "hoverable": hoverable}
+        if not isinstance(items, (Sequence, QuerySet)):
+            # plain iterators can only be consumed once, but the template may
+            # need to iterate more than once.
+            items = list(items)
+        return {"items": items, "hoverable": hoverable}
 
 
 @component.register("updateable")
@@ -112,16 +123,20 @@ class Updateable(component.Component):
 
     template_name = "conjunto/components/updateable.html"
 
+    required_attributes = ("url", "trigger", "id")
+    default_elt = "div"
+
     def get_context_data(self, **kwargs) -> dict:
         # TODO: allow multiple triggers
-        for attr in ["url", "trigger", "id"]:
-            if attr not in self.attributes:
+        attributes = self.attributes
+        for attr in self.required_attributes:
+            if attr not in attributes:
                 raise AttributeError(
                     f"{self.__class__.__name__} has no '{attr}' attribute."
                 )
         return {
-            "id": self.attributes["id"],
-            "elt": self.attributes.get("elt", "div"),
-            "url": self.attributes["url"],
-            "trigger": self.attributes["trigger"],
+            "id": attributes["id"],
+            "elt": attributes.get("elt", self.default_elt),
+            "url": attributes["url"],
+            "trigger": attributes["trigger"],
         }
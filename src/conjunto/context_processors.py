@@ -1,16 +1,58 @@
+import functools
+from types import MappingProxyType
+
 from django.conf import settings as django_settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import SimpleLazyObject
 from conjunto.menu import Menu
 
 __all__ = ["globals", "settings"]
 
 
+@functools.lru_cache(maxsize=1)
+def _get_version() -> str:
+    """Returns the installed version of the project, determined once per process.
+
+    The project is looked up via the (optional) ``PROJECT_NAME`` setting. If it is
+    not set, or the distribution is not installed, an empty string is returned.
+    """
+    from importlib import metadata
+
+    project_name = getattr(django_settings, "PROJECT_NAME", "")
+    if not project_name:
+        return ""
+    try:
+        return metadata.version(project_name)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+@functools.lru_cache(maxsize=1)
+def _get_globals() -> MappingProxyType:
+    """Returns the request independent global variables, built once per process."""
+    return MappingProxyType(
+        {
+            "project_title": django_settings.PROJECT_TITLE,
+            "version": _get_version(),
+        }
+    )
+
+
+@receiver(setting_changed)
+def _clear_globals_cache(*, setting, **kwargs):
+    if setting in ("PROJECT_TITLE", "PROJECT_NAME"):
+        _get_version.cache_clear()
+        _get_globals.cache_clear()
+
+
 def globals(request):
+    menus = Menu(request)
     return {
-        "globals": {
-            "project_title": django_settings.PROJECT_TITLE,
-            # "version": __version__,
-        },
-        "menus": Menu(request),
+        "globals": _get_globals(),
+        "menus": menus,
+        # `menus.perms_hash` would be looked up as menu name in templates
+        "menus_perms_hash": SimpleLazyObject(lambda: menus.perms_hash),
     }
 
 
@@ -5,7 +5,7 @@ from django.db.models import IntegerChoices
 from dynamic_forms import DynamicField, DynamicFormMixin
 from django.utils.translation import gettext_lazy as _
 
-logger = logging.getLogger(__file__)
+logger = logging.getLogger(__name__)
 
 
 # class DependencyFormMixin:
@@ -74,13 +74,18 @@ logger = logging.getLogger(__file__)
 
 class ErrorLogMixin:
     """A mixin that can be added to a Form during development/debugging, so that it
-    logs all form errors."""
+    logs all form errors.
+
+    Errors are logged with INFO level to the `conjunto.forms` logger. Don't use
+    it in production forms.
+    """
 
     def add_error(self, field, error):
-        if field:
-            logger.info("Form error on field %s: %s", field, error)
-        else:
-            logger.info("Form error: %s", error)
+        if logger.isEnabledFor(logging.INFO):
+            if field:
+                logger.info("Form error on field %s: %s", field, error)
+            else:
+                logger.info("Form error: %s", error)
         super().add_error(field, error)
 
 
@@ -106,20 +111,27 @@ class MyDynamicFormMixin:
     class Meta:
         excluded_fields_method = ExcludeMethod.HIDE
 
+    _excluded_fields_method = ExcludeMethod.HIDE
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resolve Meta options once per class, not on every form instantiation
+        cls._excluded_fields_method = getattr(
+            cls.Meta, "excluded_fields_method", ExcludeMethod.HIDE
+        )
+
     def __init__(self, *args, **kwargs):
         self.context = kwargs.pop("context", None)
         super().__init__(*args, **kwargs)
 
-        for name, field in list(self.fields.items()):
+        excluded_fields_method = self._excluded_fields_method
+        # snapshot the keys only, as fields may be deleted during iteration
+        for name in list(self.fields):
+            field = self.fields[name]
             if isinstance(field, DynamicField):
                 if field.should_be_included(self):
                     self.fields[name] = field.make_real_field(self)
                 else:
-                    excluded_fields_method = (
-                        self.Meta.excluded_fields_method
-                        if (hasattr(self.Meta, "excluded_fields_method"))
-                        else (ExcludeMethod.HIDE)
-                    )
                     if excluded_fields_method == ExcludeMethod.DELETE:
                         del self.fields[name]
                     elif excluded_fields_method == ExcludeMethod.HIDE:
@@ -165,16 +177,27 @@ class DynamicHtmxFormMixin(DynamicFormMixin):
         update_url: str = "."
         trigger: str = "change"
 
+    _trigger_fields: list[str] | None = []
+    _update_url: str = "."
+    _trigger: str = "change"
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # resolve Meta options once per class, not on every form instantiation
+        meta = getattr(cls, "Meta", None)
+        cls._trigger_fields = getattr(meta, "trigger_fields", None)
+        cls._update_url = getattr(meta, "update_url", ".")
+        cls._trigger = getattr(meta, "trigger", "change")
+
     def __init__(self, form_id, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.form_id = form_id
 
-        if not hasattr(self.Meta, "trigger_fields"):
+        if self._trigger_fields is None:
             raise AttributeError(
                 f"{self.__class__.__name__}.Meta has no 'trigger_fields' attribute."
             )
 
-        trigger = self.Meta.trigger if hasattr(self.Meta, "trigger") else "changed"
         include_list = ",".join(
             [
                 f"[name={field}]"
@@ -184,19 +207,19 @@ class DynamicHtmxFormMixin(DynamicFormMixin):
         )
         self.context["form_attrs"] = f"hx-include={include_list}"
 
-        for field_name in self.Meta.trigger_fields:
+        target = f"#{self.form_id}"
+        htmx_attrs = {
+            "hx-trigger": self._trigger,
+            "hx-get": self.get_update_url(),
+            "hx-target": target,
+            "hx-select": target,
+            # "hx-push-url": "true",
+            "hx-swap": "outerHTML",
+        }
+        for field_name in self._trigger_fields:
             field = self.fields.get(field_name)
             if field:
-                field.widget.attrs.update(
-                    {
-                        "hx-trigger": trigger,
-                        "hx-get": self.get_update_url(),
-                        "hx-target": f"#{self.form_id}",
-                        "hx-select": f"#{self.form_id}",
-                        # "hx-push-url": "true",
-                        "hx-swap": "outerHTML",
-                    }
-                )
+                field.widget.attrs.update(htmx_attrs)
 
         # # check if form has an "on_changed_<field_name>()" method
         # on_changed_method = getattr(self, f"on_changed_{field_name}")
@@ -221,10 +244,7 @@ class DynamicHtmxFormMixin(DynamicFormMixin):
         #             on_changed_method(value)
 
     def get_update_url(self):
-        if hasattr(self.Meta, "update_url"):
-            return self.Meta.update_url
-        else:
-            return "."
+        return self._update_url
 
     def fields_required(self, fields: str | list[str], msg: str = None) -> None:
         """Helper method used for conditionally marking fields as required.
@@ -239,9 +259,9 @@ class DynamicHtmxFormMixin(DynamicFormMixin):
             is_person = self.cleaned_data.get("is_person")
 
             if is_person:
-                self.field_required(["first_name", "last_name"])
-                self.field_required("title", "A title is definitely required here.")
-                self.field_required(["age", "size"], "You forgot this field.")
+                self.fields_required(["first_name", "last_name"])
+                self.fields_required("title", "A title is definitely required here.")
+                self.fields_required(["age", "size"], "You forgot this field.")
             else:
                 self.cleaned_data["first_name"] = ""
                 self.cleaned_data["last_name"] = ""
@@ -252,13 +272,13 @@ class DynamicHtmxFormMixin(DynamicFormMixin):
         Credits go to
         https://www.fusionbox.com/blog/detail/creating-conditionally-required-fields-in-django-forms/577/
         """
-        if type(fields) is str:
-            fields = [fields]
+        if isinstance(fields, str):
+            fields = (fields,)
+        error = None
         for field in fields:
             if not self.cleaned_data.get(field, ""):
-                msg = (
-                    forms.ValidationError(msg)
-                    if msg
-                    else forms.ValidationError(_("This field is required."))
-                )
-                self.add_error(field, msg)
+                if error is None:
+                    error = forms.ValidationError(
+                        msg or _("This field is required."), code="required"
+                    )
+                self.add_error(field, error)
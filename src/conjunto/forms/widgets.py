@@ -14,10 +14,14 @@ class DatePickerInput(forms.widgets.DateInput):
 
     template_name = "conjunto/widgets/datepicker_input.html"
 
+    base_attrs = {"autocomplete": "off"}
+
     def __init__(self, attrs=None, end_field_name=None):
-        if attrs is None:
-            attrs = {}
-        attrs.update({"autocomplete": "off"})
-        if end_field_name:
-            attrs.update({"data-end-field": end_field_name})
+        # Widget.__init__() copies the attrs, so base_attrs can be passed directly
+        if attrs or end_field_name:
+            attrs = {**(attrs or {}), **self.base_attrs}
+            if end_field_name:
+                attrs["data-end-field"] = end_field_name
+        else:
+            attrs = self.base_attrs
         super().__init__(attrs)
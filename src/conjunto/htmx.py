@@ -1,11 +1,13 @@
 from django.http import HttpRequest
-from django.urls import reverse, URLPattern, path
+from django.urls import URLPattern, path
 from gdaps.api import InterfaceRegistry
 
 from conjunto.menu import IActionButton
-from conjunto.tools import camel_case2snake
+from conjunto.tools import camel_case2snake, reverse_cached
 from conjunto.views import HtmxResponseMixin
 
+_ALLOWED_METHODS = frozenset({"get", "post"})
+
 
 class HxLink:
     """Render a hyperlink using HTMX.
@@ -17,6 +19,8 @@ class HxLink:
         dialog: whether to open a modal dialog. Defaults to `False`.
     """
 
+    __slots__ = ("url", "text", "dialog", "_html")
+
     def __init__(
         self,
         url: str,
@@ -28,13 +32,12 @@ class HxLink:
         self.text = text
         self.dialog = dialog
         if icon:
-            self.text = f"{Icon(icon)}'></i> {text}"
+            self.text = f"{Icon(icon)} {text}"
+        target = " hx-target='#dialog'" if dialog else ""
+        self._html = f"<a href='#' hx-get='{url}'{target}>{self.text}</a>"
 
     def __str__(self):
-        target = ""
-        if self.dialog:
-            target = " hx-target='#dialog'"
-        return f"<a href='#' hx-get='{self.url}'{target}>{self.text}</a>"
+        return self._html
 
 
 class Icon:
@@ -44,11 +47,14 @@ class Icon:
         name: the name of the icon
     """
 
+    __slots__ = ("name", "_html")
+
     def __init__(self, name: str):
         self.name = name
+        self._html = f"<i class='bi bi-{name}'></i>"
 
     def __str__(self):
-        return f"<i class='bi bi-{self.name}'></i>"
+        return self._html
 
 
 class HxButton:
@@ -71,6 +77,19 @@ class HxButton:
         ```
     """
 
+    __slots__ = (
+        "url",
+        "view_name",
+        "icon",
+        "dialog",
+        "target",
+        "css_class",
+        "title",
+        "method",
+        "_prefix",
+        "_suffix",
+    )
+
     def __init__(
         self,
         url: str = None,
@@ -82,41 +101,47 @@ class HxButton:
         target: str = None,
         title: str = None,
     ):
-        if not url and not view_name:
+        # exactly one of url/view_name is needed, and target excludes dialog
+        if (not url) == (not view_name) or (target and dialog):
+            if target and dialog:
+                raise AttributeError("'target' and 'dialog' cannot be used together")
+            if url:
+                raise AttributeError("'url' and 'view_name' cannot be used together")
             raise AttributeError("'url' or 'view_name' must be provided")
-        if url and view_name:
-            raise AttributeError("'url' and 'view_name' cannot be used together")
+        method = method or "get"
+        if method not in _ALLOWED_METHODS:
+            raise ValueError(f"method must be 'get' or 'post', not '{method}'")
+
         self.url = url
         self.view_name = view_name
         self.icon = icon
-        if target and dialog:
-            raise AttributeError("'target' and 'dialog' cannot be used together")
         self.dialog = dialog
         self.target = target
         self.css_class = css_class
         self.title = title
-
-        if not method:
-            method = "get"
-        if method not in ["get", "post"]:
-            raise ValueError(f"method must be 'get' or 'post', not '{method}'")
         self.method = method
 
-    def render(self, *args, **kwargs):
-        if self.view_name:
-            self.url = reverse(self.view_name, args=args, kwargs=kwargs)
-        target = ""
+        # everything except the URL is fixed, so build the HTML around it only once
         if self.dialog:
-            target = " hx-target='#dialog'"
-        elif target:
-            target = f" hx-target='{target}'"
+            target_attr = " hx-target='#dialog'"
+        elif self.target:
+            target_attr = f" hx-target='{self.target}'"
+        else:
+            target_attr = ""
         title_attr = f" title='{self.title}'" if self.title else ""
-
-        return (
-            f"<button hx-{self.method}='{self.url}'{target} "
-            f"class='{self.css_class}'{title_attr}>{Icon(self.icon)}</a>"
+        icon_html = Icon(self.icon) if self.icon else ""
+        self._prefix = f"<button hx-{self.method}='"
+        self._suffix = (
+            f"'{target_attr} class='{self.css_class}'{title_attr}>{icon_html}</button>"
         )
 
+    def render(self, *args, **kwargs):
+        if self.view_name:
+            url = reverse_cached(self.view_name, args=args, kwargs=kwargs)
+        else:
+            url = self.url
+        return self._prefix + url + self._suffix
+
     def __str__(self):
         return self.render()
 
@@ -129,22 +154,28 @@ class HxActionButton(HxButton):
         action_button: the IActionButton class
     """
 
+    __slots__ = ()
+
     def __init__(
-        self, request: HttpRequest, action_button: IActionButton, *args, **kwargs
+        self,
+        request: HttpRequest,
+        action_button: IActionButton,
+        *args,
+        css_class: str = "",
+        **kwargs,
     ):
-        css_class = kwargs.pop("css_class", "")
-        css_class += " btn-action"
         # initialize the button with the IActionButton's values
-        kwargs.update(
-            dict(
-                method=action_button.method,
-                icon=action_button.icon,
-                css_class=css_class.strip(),
-                view_name=action_button.view_name,
-                title=action_button.title,
-            )
+        super().__init__(
+            *args,
+            **{
+                **kwargs,
+                "method": action_button.method,
+                "icon": action_button.icon,
+                "css_class": f"{css_class} btn-action" if css_class else "btn-action",
+                "view_name": action_button.view_name,
+                "title": action_button.title,
+            },
         )
-        super().__init__(*args, **kwargs)
 
     def __str__(self):
         raise NotImplementedError(
@@ -152,7 +183,6 @@ class HxActionButton(HxButton):
         )
 
     def render(self, row_object, *args, **kwargs):
-        # button = self.action_button_class(kwargs["request"], row_object)
         return super().render(pk=row_object.pk)
 
 
@@ -235,6 +265,25 @@ class IHtmxComponentMixin(HtmxResponseMixin):
     # HTMX is always enforced for components
     enforce_htmx = True
 
+    _component_name: str = ""
+    _urlpattern: URLPattern | None = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._component_name = camel_case2snake(cls.__name__)
+        # the urlpattern only depends on class attributes, so build it only once
+        if cls.name and hasattr(cls, "as_view"):
+            params = [f"<{p}>" for p in cls.params]
+            # if in production, hash component name, to hide it from prying eyes...
+            component_name = cls._component_name
+            if params:
+                url = f"{component_name}/{'/'.join(params)}/{cls.name}/"
+            else:
+                url = f"{component_name}/{cls.name}/"
+            cls._urlpattern = path(url, cls.as_view(), name=cls.name)
+        else:
+            cls._urlpattern = None
+
     def __init__(self, *args, **kwargs):
         if not self.name:
             raise AttributeError(
@@ -267,18 +316,7 @@ class IHtmxComponentMixin(HtmxResponseMixin):
         Returns:
             a URLPattern that can be used in your urls.py
         """
-        params = [f"<{p}>" for p in self.params]
-        # if in production, hash component name, to hide it from prying eyes...
-        component_name = camel_case2snake(self.__class__.__name__)
-        if params:
-            url = f"{component_name}/{'/'.join(params)}/{self.name}/"
-        else:
-            url = f"{component_name}/{self.name}/"
-        return path(
-            url,
-            self.__class__.as_view(),
-            name=self.name,
-        )
+        return self._urlpattern
 
     @classmethod
     def get_url_patterns(cls) -> list[URLPattern]:
@@ -300,13 +338,19 @@ class IHtmxComponentMixin(HtmxResponseMixin):
 
             url_patterns += IUserProfileSectionView.get_url_patterns()
             ```
+
+        The patterns are collected only once per class, as all plugins are
+        registered when the urlconf is loaded.
         """
-        patterns = []
-        for interface in InterfaceRegistry._interfaces:
-            if issubclass(interface, cls):
-                for plugin in interface:
-                    patterns.append(plugin.get_urlpattern())
-        return patterns
+        patterns = cls.__dict__.get("_url_patterns")
+        if patterns is None:
+            patterns = []
+            for interface in InterfaceRegistry._interfaces:
+                if issubclass(interface, cls):
+                    for plugin in interface:
+                        patterns.append(plugin.get_urlpattern())
+            cls._url_patterns = patterns
+        return list(patterns)
 
     def enabled(self) -> bool:
         # FIXME: rename into "visible"
@@ -362,17 +406,25 @@ class UseComponentMixin:
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        component_dict = {}
-        active_component = None
-        for plugin_class in self.components:
-            implementations = list(plugin_class)
-            component_dict[plugin_class.__name__] = implementations
-            for plugin in implementations:
-                if plugin.name == self.request.GET.get(self.query_variable, None):
-                    active_component = plugin.name
-            # if no component is selected via GET, use the default one
-            if not active_component:
-                active_component = self.default_component_name
+        component_dict = {
+            # iterate the interface on each request, as implementations may be
+            # enabled or disabled at runtime
+            plugin_class.__name__: list(plugin_class)
+            for plugin_class in self.components
+        }
+        requested = self.request.GET.get(self.query_variable, None)
+        # if no (known) component is selected via GET, use the default one
+        active_component = self.default_component_name
+        if requested:
+            active_component = next(
+                (
+                    plugin.name
+                    for implementations in component_dict.values()
+                    for plugin in implementations
+                    if plugin.name == requested
+                ),
+                active_component,
+            )
 
         context.update(
             {"components": component_dict, "active_component": active_component}
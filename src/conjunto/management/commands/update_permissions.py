@@ -15,17 +15,17 @@ logger = logging.getLogger(__file__)
 class Command(UpdatePermissionsCommand):
     """Reload permissions of all (given) apps.
 
-    Checks all (given) apps for a group_permissions attribute and creates Group permissions using that schema.
+    Checks all (given) apps for a groups_permissions attribute and creates Group permissions using that schema.
 
     ```python
     # apps.py
     import ...
 
     class MyPackageCppConfig(AppConfig):
-        group_permissions: {
-            "Authors": { my_package.MyContentTypeModel: ["view", "change"],
+        groups_permissions = {
+            "Authors": {my_package.MyContentTypeModel: ["view", "change"]},
             # on my special site, admins may not change content, just add/delete it!
-            "Site admins": { "my_package.MyContentTypeModel": ["view", "add", "delete"],
+            "Site admins": {"my_package.MyContentTypeModel": ["view", "add", "delete"]},
         }
     ```
     """
@@ -41,13 +41,18 @@ class Command(UpdatePermissionsCommand):
         else:
             apps = django_apps.get_app_configs()
 
-        # loop through all (given) apps, and recreate their group permissions
+        # collect the group permissions of all (given) apps first, and recreate
+        # them in one go, so that each group is fetched only once.
+        apps_permissions = {}
         for app in apps:
-            if hasattr(app, "groups_permissions"):
-                conjunto.tools.create_groups_permissions(app.groups_permissions)
-                if options["verbosity"] >= 2:
-                    self.stdout.write(
-                        self.style.SUCCESS(
-                            f"Created groups permissions for {app.label}"
-                        )
-                    )
+            groups_permissions = getattr(app, "groups_permissions", None)
+            if groups_permissions:
+                apps_permissions[app.label] = groups_permissions
+        conjunto.tools.create_groups_permissions(
+            conjunto.tools.merge_groups_permissions(*apps_permissions.values())
+        )
+        if options["verbosity"] >= 2:
+            for label in apps_permissions:
+                self.stdout.write(
+                    self.style.SUCCESS(f"Created groups permissions for {label}")
+                )
@@ -1,9 +1,86 @@
-import re
+import functools
+import hashlib
+from operator import attrgetter
 from typing import Iterable
 
+from django.core.cache import cache
 from django.utils.text import slugify
+from django.utils.translation import get_language
 from gdaps.api import Interface
 
+NON_CALLABLE_ATTRIBUTES = frozenset(
+    {
+        "weight",
+        "separator",
+        "required_permissions",
+        "view_name",
+        "exact_url",
+    }
+)
+INTERNAL_ATTRIBUTES = frozenset(
+    {
+        "menu",
+        "url",
+        "slug",
+        "title",
+        "weight",
+        "icon",
+        "separator",
+        "required_permissions",
+        "view_name",
+        "badge",
+        "disabled",
+        "exact_url",
+        "check",
+        "visible",
+        "collapsed",
+    }
+)
+
+
+def has_perms(request, perms: Iterable[str]) -> bool:
+    """Returns `True` if the user of the request has all the given permissions.
+
+    Menu items and action buttons often check the same permissions many times per
+    request (e.g. once per table row), so the results are memoized on the request.
+    """
+    key = frozenset(perms)
+    try:
+        results = request._conjunto_perms_cache
+    except AttributeError:
+        results = request._conjunto_perms_cache = {}
+    try:
+        return results[key]
+    except KeyError:
+        result = results[key] = request.user.has_perms(key)
+        return result
+
+
+MENU_CACHE_VERSION_KEY = "conjunto:menu:version"
+
+
+def get_menu_cache_version() -> int:
+    """Returns the current version of cached menu fragments."""
+    return cache.get_or_set(MENU_CACHE_VERSION_KEY, 1, None)
+
+
+def invalidate_menu_cache(**kwargs):
+    """Invalidates all cached menu fragments that use `Menu.perms_hash`.
+
+    Can be used as signal receiver too, e.g. when menu items depend on data that
+    changes.
+    """
+    try:
+        cache.incr(MENU_CACHE_VERSION_KEY)
+    except ValueError:
+        cache.set(MENU_CACHE_VERSION_KEY, 2, None)
+
+
+@functools.lru_cache(maxsize=1024)
+def _slugify_title(title: str) -> str:
+    """Memoized `slugify()`, as menu titles are the same for all requests."""
+    return slugify(title)
+
 
 class MenuItemInterfaceMixin:
     """
@@ -24,6 +101,7 @@ class MenuItemInterfaceMixin:
             like in urls.py) under which this menu item should show up.
             If left empty, the menu item will show up under all views.
         required_permissions: The permissions necessary to view this menu item.
+            Can be a single permission string or an iterable of permissions.
             !!! warning
                 this has nothing to do with the required permissions to call the URL
                 that this MenuItem points to. You must make sure for yourself that
@@ -43,27 +121,51 @@ class MenuItemInterfaceMixin:
     slug: str = ""
     view_name: str = ""
     icon: str = None
-    required_permissions: list = []  # FIXME: rename to permissions_required
+    # FIXME: rename to permissions_required
+    required_permissions: frozenset[str] = frozenset()
     disabled: bool = False
     visible: bool = True  # FIXME: `check` and `visible` are more or less duplicated.
     check: bool = True
 
+    _attr_names: tuple[tuple[str, str], ...] = ()
+    _callable_attrs: tuple[str, ...] = ()
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # the attributes rendered by `attrs` only depend on the class
+        cls._attr_names = tuple(
+            (attr, attr.replace("_", "-"))
+            for attr in cls.__dict__
+            if not attr.startswith("_") and attr not in INTERNAL_ATTRIBUTES
+        )
+        # a single permission may be given as string
+        if isinstance(cls.required_permissions, str):
+            cls.required_permissions = frozenset((cls.required_permissions,))
+        else:
+            cls.required_permissions = frozenset(cls.required_permissions)
+        # whether an attribute is callable is a property of the class, too
+        cls._callable_attrs = tuple(
+            attr
+            for attr in cls.CALLABLE_ATTRIBUTES
+            if callable(getattr(cls, attr, None))
+        )
+
     def __init__(self, request):
         self.request = request
-        self._children = []
+        # children are resolved lazily, or set by the Menu building this item
+        self._children = None
         # check permissions, and set visible as needed
-        if self.required_permissions:
-            if isinstance(self.required_permissions, str):
-                self.required_permissions = [self.required_permissions]
-            if not request.user.has_perms(self.required_permissions):
-                self.visible = False
-                return
+        if self.required_permissions and not has_perms(
+            request, self.required_permissions
+        ):
+            self.visible = False
+            return
 
         self._prepare_callable_attributes()
 
         # create slug form title if not available
         if not self.slug:
-            self.slug = slugify(self.title)
+            self.slug = _slugify_title(str(self.title))
 
         if not self.check:
             self.visible = False
@@ -72,53 +174,40 @@ class MenuItemInterfaceMixin:
     def _prepare_callable_attributes(self):
         """Checks if any of the "callable attributes" are really callable, and sets
         them as static methods"""
-        for attr in self.CALLABLE_ATTRIBUTES:
-            # if attribute is callable, call it with current request as param
-            if callable(getattr(self, attr)):
-                # call it as static method to avoid "self" as parameter
-                setattr(self, attr, getattr(self.__class__, attr)(self.request))
+        cls = self.__class__
+        for attr in self._callable_attrs:
+            # call it as static method with the current request as param,
+            # to avoid "self" as parameter
+            setattr(self, attr, getattr(cls, attr)(self.request))
 
     def has_children(self) -> bool:
         """Returns `True` if this menu item has children, `False` otherwise."""
-        if self._children:
-            return True
-        found = False
-        for item in filter(lambda i: i.menu == self.menu and "__" in i.slug, IMenuItem):
-            # TODO improve children handling
-            parts = item.slug.split("__")
-            if len(parts) > 2:
-                raise NotImplementedError(
-                    "More than 2 levels of menus are not supported"
-                )
-            if parts[0] == self.slug:
-                child = item(self.request)
-                self._children.append(child)
-                found = True
-        self._children.sort(key=lambda item: item.weight)
-        return found
+        if self._children is None:
+            self._children = [
+                item(self.request)
+                for item in _children_index().get((self.menu, self.slug), ())
+                if item.enabled()
+            ]
+            self._children.sort(key=attrgetter("weight"))
+        return bool(self._children)
 
     def has_parent(self) -> bool:
         """Returns `True` if this menu item has a parent, `False` otherwise."""
         return "__" in self.slug
 
-    def children(self) -> Iterable:
-        """Returns an iterable of all children of this menu item."""
-        if self.has_children():
-            for item in self._children:
-                yield item
-        else:
-            return []
-
-    def _underline_to_hyphen(self, attr: str):
-        return attr.replace("_", "-")
+    @property
+    def children(self) -> list:
+        """Returns a list of all children of this menu item."""
+        if self._children is None:
+            self.has_children()
+        return self._children
 
     @property
     def attrs(self):
-        attr_str = ""
-        for attr in type(self).__dict__:
-            if not attr.startswith("_") and attr not in INTERNAL_ATTRIBUTES:
-                attr_str += f" {self._underline_to_hyphen(attr)}={getattr(self, attr)}"
-        return attr_str
+        return "".join(
+            f" {html_attr}={getattr(self, attr)}"
+            for attr, html_attr in self._attr_names
+        )
 
     @attrs.setter
     def attrs(self, value):
@@ -127,13 +216,22 @@ class MenuItemInterfaceMixin:
     def __getattr__(self, item):
         """For all attrs that are requested in the template and are
         not defined in the class, don't produce an error, just return an empty
-        string."""
+        string.
+
+        Private and special names still raise an AttributeError, so that protocol
+        lookups (like `__html__`, `__deepcopy__`) and not yet initialized private
+        attributes fail fast instead of returning a bogus value.
+        """
+        if item.startswith("_"):
+            raise AttributeError(
+                f"'{type(self).__name__}' object has no attribute '{item}'"
+            )
         return ""
 
     @classmethod
     def filter(cls, name: str):
         """Filter the menu items by the 'menu' key name."""
-        return filter(lambda item: item.menu == name, cls.plugins())
+        return (item for item in cls.plugins() if item.menu == name)
 
 
 @Interface
@@ -166,6 +264,7 @@ class IMenuItem(MenuItemInterfaceMixin):
     exact_url: bool = False
     collapsed: bool = True
     _attrs: dict = {}
+    _selected: bool = None
 
     def __init__(self, request):
         super(IMenuItem, self).__init__(request)
@@ -177,14 +276,17 @@ class IMenuItem(MenuItemInterfaceMixin):
             return
 
     def selected(self) -> bool:
-        """Check current URL against this item."""
-        is_current = False
-        if self.exact_url:  # FIXME: exact_url does not work
-            if re.match(f"{self.url}$", self.request.path):
-                is_current = True
-        elif re.match(f"{self.url}", self.request.path):
-            is_current = True
-        return is_current
+        """Check current URL against this item.
+
+        The result is computed once per item, as templates often ask more than once.
+        """
+        if self._selected is None:
+            url = str(self.url)
+            if self.exact_url:
+                self._selected = self.request.path == url
+            else:
+                self._selected = self.request.path.startswith(url)
+        return self._selected
 
 
 @Interface
@@ -213,30 +315,40 @@ class IActionButton(MenuItemInterfaceMixin):
             )
 
 
-NON_CALLABLE_ATTRIBUTES = [
-    "weight",
-    "separator",
-    "required_permissions",
-    "view_name",
-    "exact_url",
-]
-INTERNAL_ATTRIBUTES = [
-    "menu",
-    "url",
-    "slug",
-    "title",
-    "weight",
-    "icon",
-    "separator",
-    "required_permissions",
-    "view_name",
-    "badge",
-    "disabled",
-    "exact_url",
-    "check",
-    "visible",
-    "collapsed",
-]
+@functools.lru_cache(maxsize=None)
+def _children_index() -> dict[tuple[str, str], tuple[type[IMenuItem], ...]]:
+    """Returns all registered child IMenuItem classes, keyed by (menu name, parent
+    slug), sorted by weight.
+
+    Menu items are registered as plugins at import time, so the index is built only
+    once per process. Call `_children_index.cache_clear()` if plugins are
+    registered later on. It contains disabled plugins too, callers must check
+    `enabled()` on each request.
+    """
+    index: dict[tuple[str, str], list[type[IMenuItem]]] = {}
+    for item in sorted(IMenuItem.plugins(), key=attrgetter("weight")):
+        if "__" not in item.slug:
+            continue
+        # TODO improve children handling
+        parts = item.slug.split("__")
+        if len(parts) > 2:
+            raise NotImplementedError("More than 2 levels of menus are not supported")
+        index.setdefault((item.menu, parts[0]), []).append(item)
+    return {key: tuple(items) for key, items in index.items()}
+
+
+@functools.lru_cache(maxsize=None)
+def _menu_index() -> dict[str, tuple[type[IMenuItem], ...]]:
+    """Returns all registered IMenuItem classes, keyed by their menu name, sorted by
+    weight.
+
+    Like `_children_index()`, this is built only once per process, and contains
+    disabled plugins too.
+    """
+    index: dict[str, list[type[IMenuItem]]] = {}
+    for item in sorted(IMenuItem.plugins(), key=attrgetter("weight")):
+        index.setdefault(item.menu, []).append(item)
+    return {name: tuple(items) for name, items in index.items()}
 
 
 class Menu:
@@ -254,25 +366,68 @@ class Menu:
     {% endfor %}
     </ul>
     ```
+
+    Rendered menus can be cached using a template fragment cache, see
+    `perms_hash`.
     """
 
     def __init__(self, request):
         self.request = request
-        self._cache = []
-        for menu_item_class in IMenuItem:
-            item = menu_item_class(self.request)
-            self._cache.append(item)
-
-    def _items(self):
-        """walk through"""
+        # menu items are only instantiated when their menu is used in the template
+        self._cache: dict[str, list[IMenuItem]] = {}
+        self._top_level: dict[str, list[IMenuItem]] = {}
+
+    def _items(self, name: str) -> list[IMenuItem]:
+        """Returns all items of the menu with the given name, instantiated once per
+        request."""
+        items = self._cache.get(name)
+        if items is None:
+            items = self._cache[name] = [
+                menu_item_class(self.request)
+                for menu_item_class in _menu_index().get(name, ())
+                # plugins may be enabled or disabled at runtime
+                if menu_item_class.enabled()
+            ]
+            # attach the children to their parents, so that items don't need to
+            # look them up themselves
+            parents = {}
+            for menu_item in items:
+                if "__" not in menu_item.slug:
+                    menu_item._children = []
+                    parents[menu_item.slug] = menu_item
+            for menu_item in items:
+                if "__" in menu_item.slug:
+                    parent = parents.get(menu_item.slug.partition("__")[0])
+                    if parent is not None:
+                        parent._children.append(menu_item)
+            for parent in parents.values():
+                parent._children.sort(key=attrgetter("weight"))
+        return items
+
+    @functools.cached_property
+    def perms_hash(self) -> str:
+        """A string that identifies the current user's permissions and language.
+
+        It is meant to be used as part of a template fragment cache key, together
+        with the request path. As it is computed from the permissions themselves,
+        changing a user's permissions results in a new key. Stale fragments of
+        other kinds can be dropped using `invalidate_menu_cache()`.
+        """
+        user = self.request.user
+        digest = hashlib.md5(
+            "\n".join(sorted(user.get_all_permissions())).encode(),
+            usedforsecurity=False,
+        ).hexdigest()
+        return f"{user.pk}:{get_language()}:{get_menu_cache_version()}:{digest}"
 
     def __getitem__(self, item):
         """Returns filtered out menu items with the given '.menu' name."""
-        for menu_item in self._cache:
-            # TODO: handle submenus
-            if (
-                menu_item.menu == item  # only items in requested menu
-                and "." not in menu_item.slug  # only top level items
+        items = self._top_level.get(item)
+        if items is None:
+            items = self._top_level[item] = [
+                menu_item
+                for menu_item in self._items(item)
+                if "__" not in menu_item.slug  # only top level items
                 and menu_item.visible  # only visible items
-            ):
-                yield menu_item
+            ]
+        return iter(items)
@@ -1,39 +1,111 @@
-import json
+import functools
 
-from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:  # pragma: no cover
+    import json
+
+    _json_dumps = functools.partial(json.dumps, separators=(",", ":"))
+    _json_loads = json.loads
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
 from django.apps import apps
 from django.contrib.messages import get_messages
 from django.http import HttpResponse
-from django.shortcuts import reverse, redirect
+from django.shortcuts import redirect
+from django.utils.functional import SimpleLazyObject
 from django.conf import settings
 
+from conjunto.tools import reverse_cached
+
+
+@functools.cache
+def get_settings_model():
+    """Returns the model class configured in `settings.SETTINGS_MODEL`."""
+    return apps.get_model(settings.SETTINGS_MODEL)
+
+
+def get_settings():
+    """Returns the settings instance of the application.
+
+    The instance is cached by the model, so that not every request needs a database
+    query.
+    """
+    return get_settings_model().get_instance()
+
+
+def clear_settings_cache(sender, **kwargs):
+    """Signal receiver that removes the cached settings instance.
+
+    `SingletonModel` clears the cache itself when an instance is saved or deleted,
+    but not for bulk deletes of a queryset.
+    """
+    sender.clear_cache()
+
 
 class MaintenanceMiddleware:
+    """Redirects users that are not staff to the maintenance page, if the
+    maintenance mode is switched on.
+
+    Adds the application settings as `request.settings`. In sync mode they are
+    fetched lazily, so requests of staff users only fetch them if they are really
+    used. In async mode they are fetched in advance, as they may need a database
+    query, which is not allowed in async code.
+    """
+
+    async_capable = True
+    sync_capable = True
+
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
-        path = request.META.get("PATH_INFO", "")
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.process_request(request)
+        if response is None:
+            response = self.get_response(request)
+        return response
 
-        settings_model_name = settings.SETTINGS_MODEL
-        request.settings = apps.get_model(settings_model_name).get_instance()
+    async def __acall__(self, request):
+        # the user and settings may need database queries
+        response = await sync_to_async(self.process_request)(request)
+        if response is None:
+            response = await self.get_response(request)
+        return response
+
+    def process_request(self, request):
+        if self.async_mode:
+            request.settings = get_settings()
+        else:
+            request.settings = SimpleLazyObject(get_settings)
+
+        # staff users are never redirected
+        if request.user.is_staff:
+            return None
 
         # if user is logged in and is not staff, redirect to maintenance page
         # check also if requested URL is not one of the following:
         # - login page
         # - maintenance page
         # - media files
-        if not request.user.is_staff:
-            if (
-                request.settings.maintenance_mode
-                and (path not in [reverse("login"), reverse("maintenance")])
-                and not path.startswith(settings.MEDIA_URL)
-            ):
-                return redirect(reverse("maintenance") + f"?next={request.path}")
-
-        response = self.get_response(request)
-
-        return response
+        path = request.META.get("PATH_INFO", "")
+        maintenance_url = reverse_cached("maintenance")
+        if (
+            request.settings.maintenance_mode
+            and path not in (reverse_cached("login"), maintenance_url)
+            and not path.startswith(settings.MEDIA_URL)
+        ):
+            return redirect(f"{maintenance_url}?next={request.path}")
+        return None
 
 
 class HtmxMessageMiddleware:
@@ -52,7 +124,15 @@ class HtmxMessageMiddleware:
             markcoroutinefunction(self)
 
     async def __call__(self, request):
+        # request.htmx is only available if django-htmx' HtmxMiddleware ran before
+        # this one; otherwise it is checked after the response was created.
+        htmx = getattr(request, "htmx", None)
+        if htmx is not None and not htmx:
+            return await self.get_response(request)
+
         response: HttpResponse = await self.get_response(request)
+        if not request.htmx:
+            return response
         # TODO: implement device fetching in middleware
 
         # soup = BeautifulSoup(response.content, "html.parser")
@@ -60,8 +140,6 @@ class HtmxMessageMiddleware:
         # body_tag.append(soup.new_tag("div", string="test"))
         # response.content = str(soup)
         # response.content += b"<div id='request-item-15' hx-swap-oob='True'>foo</div>"
-        if not request.htmx:
-            return response
 
         # Ignore redirections, HTMX can't read it
         if 300 <= response.status_code < 400:
@@ -71,26 +149,25 @@ class HtmxMessageMiddleware:
         if "HX-Redirect" in response.headers:
             return response
 
-        # Extract the messages, if response is empty
-        if response.status_code == 204:  # Empty
-            messages = [
-                {
-                    "message": message.message,
-                    "tags": message.tags,
-                    "extra_tags": message.extra_tags,
-                }
-                for message in get_messages(request)
-            ]
-            # response.write(
-            #     render_to_string(
-            #         template_name="common/toast.html",
-            #         context={"messages": messages},
-            #         request=request,
-            #     )
-            # )
+        # Extract the messages only if response is empty
+        if response.status_code != 204:
+            return response
 
-        else:
-            messages = []
+        messages = [
+            {
+                "message": message.message,
+                "tags": message.tags,
+                "extra_tags": message.extra_tags,
+            }
+            for message in get_messages(request)
+        ]
+        # response.write(
+        #     render_to_string(
+        #         template_name="common/toast.html",
+        #         context={"messages": messages},
+        #         request=request,
+        #     )
+        # )
         if not messages:
             return response
 
@@ -102,7 +179,7 @@ class HtmxMessageMiddleware:
             hx_trigger = {}
         elif hx_trigger.startswith("{"):
             # If the HX-Trigger uses the object syntax, parse the object
-            hx_trigger = json.loads(hx_trigger)
+            hx_trigger = _json_loads(hx_trigger)
         else:
             # If the HX-Trigger uses the string syntax, convert to the object syntax
             hx_trigger = {hx_trigger: True}
@@ -111,5 +188,5 @@ class HtmxMessageMiddleware:
         hx_trigger["messages"] = messages
 
         # Add or update the HX-Trigger
-        response.headers["HX-Trigger"] = json.dumps(hx_trigger)
+        response.headers["HX-Trigger"] = _json_dumps(hx_trigger)
         return response
@@ -1,5 +1,9 @@
+import copy
+
+from django.core.cache import cache
 from django.core.exceptions import MultipleObjectsReturned
-from django.db import models, IntegrityError
+from django.db import models, DatabaseError, IntegrityError
+from django.db.models.fields.files import FieldFile
 from versionfield import VersionField
 from django.utils.translation import gettext as _
 
@@ -10,11 +14,20 @@ class SingletonModel(models.Model):
 
     Allow only one instance of the model to be created.
     To get the instance of the model, use `<YourModel>.get_instance()`.
+
+    The instance is cached using Django's cache framework. Saving or deleting it
+    clears the cache. As the cache is not rolled back with database transactions,
+    call `clear_cache()` in your tests' `setUp()`, or set `cache_timeout = 0` to
+    disable caching.
     """
 
     class Meta:
         abstract = True
 
+    cache_timeout = 30
+    """Seconds the instance is cached. With a process-local cache backend, other
+    processes may see outdated values for that long. `0` disables caching."""
+
     # _aggressive = False
 
     def save(self, *args, **kwargs):
@@ -32,6 +45,21 @@ class SingletonModel(models.Model):
                 f"There can be only one {self.__class__.__name__} instance."
             )
         super().save(*args, **kwargs)
+        self.clear_cache()
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        self.clear_cache()
+        return result
+
+    @classmethod
+    def _cache_key(cls) -> str:
+        return f"conjunto:singleton:{cls._meta.label_lower}"
+
+    @classmethod
+    def clear_cache(cls):
+        """Removes the cached instance."""
+        cache.delete(cls._cache_key())
 
     @classmethod
     def get_instance(cls):
@@ -43,7 +71,17 @@ class SingletonModel(models.Model):
         Raises:
             IntegrityError: if there are more than one objects saved in the databases.
         """
+        if cls.cache_timeout == 0:
+            return cls._get_instance_from_db()
+        key = cls._cache_key()
+        instance = cache.get(key)
+        if instance is None:
+            instance = cls._get_instance_from_db()
+            cache.set(key, instance, cls.cache_timeout)
+        return instance
 
+    @classmethod
+    def _get_instance_from_db(cls):
         try:
             return cls.objects.get()
         except cls.DoesNotExist:
@@ -79,7 +117,8 @@ class VersionedPage(Page):
     class Meta:
         abstract = True
 
-    version = VersionField(default="1.0.0")
+    # indexed, as the latest version is looked up by ordering by version
+    version = VersionField(default="1.0.0", db_index=True)
 
     def __str__(self):
         return f"{self.title} (v{self.version})"
@@ -117,3 +156,66 @@ class AbstractSettings(SingletonModel):
 
     def __str__(self):
         return _("Settings")
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # remember the loaded values, unless some fields are deferred
+        if len(values) == len(cls._meta.concrete_fields):
+            instance._remember_field_values()
+        return instance
+
+    def _field_values(self) -> dict:
+        """Returns the current values of all concrete fields except the pk."""
+        pk_attname = self._meta.pk.attname
+        values = {}
+        for field in self._meta.concrete_fields:
+            if field.attname == pk_attname:
+                continue
+            value = getattr(self, field.attname)
+            if isinstance(value, FieldFile):
+                value = value.name
+            values[field.attname] = value
+        return values
+
+    def _remember_field_values(self):
+        # copy the values, so that mutable values changed in place are detected
+        self._loaded_values = copy.deepcopy(self._field_values())
+
+    def _changed_fields(self) -> list[str] | None:
+        """Returns the names of the fields that changed since the instance was
+        loaded, or `None` if that is not known."""
+        loaded_values = getattr(self, "_loaded_values", None)
+        if loaded_values is None or self._state.adding or self.pk is None:
+            return None
+        return [
+            name
+            for name, value in self._field_values().items()
+            if loaded_values[name] != value
+        ]
+
+    def _row_exists(self, using) -> bool:
+        return type(self)._base_manager.using(using).filter(pk=self.pk).exists()
+
+    def save(self, *args, **kwargs):
+        """Save the settings, updating only the fields that changed since they
+        were loaded, so that e.g. toggling the maintenance mode doesn't rewrite
+        all text fields.
+
+        If no changes are known, all fields are saved as usual.
+        """
+        changed_fields = None
+        if not args and kwargs.get("update_fields") is None:
+            changed_fields = self._changed_fields()
+        if changed_fields:
+            kwargs.pop("update_fields", None)
+            try:
+                super().save(*args, update_fields=changed_fields, **kwargs)
+            except DatabaseError:
+                # if the row is gone, save it completely, which inserts it again
+                if self._row_exists(kwargs.get("using") or self._state.db):
+                    raise
+                super().save(*args, **kwargs)
+        else:
+            super().save(*args, **kwargs)
+        self._remember_field_values()
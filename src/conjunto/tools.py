@@ -1,9 +1,13 @@
+import functools
 import locale
 import subprocess
 
 from django.conf import settings
+from django.core.signals import setting_changed
 from django.db.models import Model
-from django.utils.translation import gettext_lazy as _
+from django.dispatch import receiver
+from django.urls import reverse, get_script_prefix, get_urlconf
+from django.utils.translation import get_language, gettext_lazy as _
 
 import logging
 
@@ -108,40 +112,101 @@ def create_groups_permissions(
     from django.contrib.auth.models import Group, Permission
     from django.contrib.contenttypes.models import ContentType
 
-    for group_name in groups_permissions:
+    for group_name, models_permissions in groups_permissions.items():
         # Get or create group (even if there are no permissions
         # to save in the dict)
         group, created = Group.objects.get_or_create(name=group_name)
-        if created:
-            group.save()
 
         # Loop models in group
-        for model in groups_permissions[group_name]:
+        for model, perm_names in models_permissions.items():
             # if model_class is written as dotted str, convert it to class
             if isinstance(model, str):
                 model_class = apps.get_model(model)
             else:
                 model_class = model
 
-            # Loop permissions in group/model
-
-            for perm_name in groups_permissions[group_name][model]:
-                # Generate permission name as Django would generate it
-                codename = f"{perm_name}_{model_class._meta.model_name}"
-
-                try:
-                    # Find permission object and add to group
-                    content_type = ContentType.objects.get(
-                        app_label=model_class._meta.app_label,
-                        model=model_class._meta.model_name.lower(),
-                    )
-                    perm = Permission.objects.get(
-                        content_type=content_type,
-                        codename=codename,
-                    )
-                    group.permissions.add(perm)
+            # ContentTypes are cached by Django, so this usually is no query.
+            content_type = ContentType.objects.get_for_model(
+                model_class, for_concrete_model=False
+            )
+            # Generate permission names as Django would generate them
+            codenames = [
+                f"{perm_name}_{model_class._meta.model_name}"
+                for perm_name in perm_names
+            ]
+            # Find all permission objects of this model at once and add them to group
+            perms = list(
+                Permission.objects.filter(
+                    content_type=content_type, codename__in=codenames
+                )
+            )
+            group.permissions.add(*perms)
+
+            found = {perm.codename for perm in perms}
+            for codename in codenames:
+                if codename in found:
                     logger.info(
                         f"  Adding permission '{codename}' to group '{group.name}'"
                     )
-                except Permission.DoesNotExist:
+                else:
                     logger.critical(f"  ERROR: Permission '{codename}' not found.")
+
+
+def merge_groups_permissions(
+    *groups_permissions: dict[str, dict[Model | str, list[str]]]
+) -> dict[str, dict[Model | str, list[str]]]:
+    """Merges several `groups_permissions` dicts into one.
+
+    Permissions of groups and models that occur in more than one dict are
+    combined, so that they can be created with one call to
+    [create_groups_permissions][conjunto.tools.create_groups_permissions].
+    """
+    merged: dict[str, dict[Model | str, list[str]]] = {}
+    for schema in groups_permissions:
+        for group_name, models_permissions in schema.items():
+            group = merged.setdefault(group_name, {})
+            for model, perm_names in models_permissions.items():
+                perms = group.setdefault(model, [])
+                perms.extend(p for p in perm_names if p not in perms)
+    return merged
+
+
+@functools.lru_cache(maxsize=2048)
+def _reverse_cached(
+    view_name: str,
+    args: tuple,
+    kwargs_items: tuple,
+    prefix: str,
+    urlconf,
+    language: str | None,
+) -> str:
+    return reverse(view_name, urlconf=urlconf, args=args, kwargs=dict(kwargs_items))
+
+
+def reverse_cached(view_name: str, args=None, kwargs=None) -> str:
+    """Memoized version of Django's `reverse()`.
+
+    Buttons are often rendered once per table row with the same view name, and
+    only differing params. The result is cached per view name, params, script
+    prefix, urlconf and active language (for `i18n_patterns` and translated URLs).
+    Unhashable params are passed to `reverse()` directly.
+    """
+    args = tuple(args) if args else ()
+    kwargs_items = tuple(sorted(kwargs.items())) if kwargs else ()
+    try:
+        return _reverse_cached(
+            view_name,
+            args,
+            kwargs_items,
+            get_script_prefix(),
+            get_urlconf(),
+            get_language(),
+        )
+    except TypeError:
+        return reverse(view_name, args=args, kwargs=kwargs)
+
+
+@receiver(setting_changed)
+def _clear_reverse_cache(*, setting, **kwargs):
+    if setting == "ROOT_URLCONF":
+        _reverse_cached.cache_clear()
@@ -186,21 +186,19 @@ class ModalFormViewMixin(HtmxFormMixin):
     dialog_type: DialogType = DialogType.NOTSET
     """The type of the dialog: INFO, """
 
+    _dialog_type_styles = {
+        DialogType.DELETE: ("trash", "danger danger"),
+        DialogType.INFO: ("info-circle", "info info"),
+    }
+    """The icon and css class used for each dialog type."""
+
     def get_modal_title(self) -> str:
         """Returns a string that is used as title of the modal."""
         return self.modal_title
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        icon = ""
-        klass = ""
-        match self.dialog_type:
-            case DialogType.DELETE:
-                icon = "trash"
-                klass = "danger danger"
-            case DialogType.INFO:
-                icon = "info-circle"
-                klass = "info info"
+        icon, klass = self._dialog_type_styles.get(self.dialog_type, ("", ""))
         context.update(
             {
                 "modal_title": self.get_modal_title(),
@@ -280,14 +278,17 @@ class DynamicHtmxFormViewMixin(PrepopulateFormViewMixin):
     """
 
     form_id: str = ""
+    _default_form_id: str = ""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._default_form_id = f"form_id_{camel_case2snake(cls.__name__)}"
 
     def get_form_kwargs(self):
         kwargs = super().get_form_kwargs()
         kwargs["context"] = self.get_initial()
         kwargs["context"].update(clean_dict(self.request.GET.dict()))
-        kwargs["form_id"] = (
-            self.form_id or f"form_id_{camel_case2snake(self.__class__.__name__)}"
-        )
+        kwargs["form_id"] = self.form_id or self._default_form_id
         return kwargs
 
 
@@ -307,7 +308,7 @@ class LatestVersionMixin:
     no_object_available: str = ""
 
     def get_object(self):
-        return super().get_queryset().order_by("-version").last()
+        return super().get_queryset().order_by("-version").first()
 
     def get_context_data(self, *args, **kwargs):
         context = super().get_context_data(*args, **kwargs)
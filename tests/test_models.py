@@ -0,0 +1,120 @@
+from unittest import mock
+
+import pytest
+from django.db import DatabaseError, models
+
+from conjunto.models import AbstractSettings, SingletonModel
+
+
+class ExampleSettings(AbstractSettings):
+    data = models.JSONField(default=dict)
+
+    class Meta:
+        app_label = "conjunto"
+
+
+def loaded_settings(**values) -> ExampleSettings:
+    """Returns an ExampleSettings instance as if it was loaded from the database."""
+    instance = ExampleSettings(id=1, **values)
+    field_names = [field.attname for field in ExampleSettings._meta.concrete_fields]
+    return ExampleSettings.from_db(
+        "default", field_names, [getattr(instance, name) for name in field_names]
+    )
+
+
+def test_changed_fields_excludes_pk():
+    settings = loaded_settings()
+    settings.maintenance_mode = True
+    assert settings._changed_fields() == ["maintenance_mode"]
+
+
+def test_changed_fields_detects_in_place_changes():
+    settings = loaded_settings(data={"foo": 1})
+    settings.data["foo"] = 2
+    assert settings._changed_fields() == ["data"]
+
+
+def test_changed_fields_unknown_without_pk():
+    settings = loaded_settings()
+    settings.pk = None
+    assert settings._changed_fields() is None
+
+
+def test_changed_fields_unknown_for_new_instances():
+    assert ExampleSettings()._changed_fields() is None
+
+
+def test_save_only_changed_fields():
+    settings = loaded_settings()
+    settings.maintenance_mode = True
+    with mock.patch.object(SingletonModel, "save") as save:
+        settings.save()
+    save.assert_called_once_with(update_fields=["maintenance_mode"])
+    assert settings._changed_fields() == []
+
+
+def test_save_without_changes_saves_all_fields():
+    settings = loaded_settings()
+    with mock.patch.object(SingletonModel, "save") as save:
+        settings.save()
+    save.assert_called_once_with()
+
+
+def test_save_without_pk_saves_all_fields():
+    settings = loaded_settings()
+    settings.pk = None
+    settings.site_name = "foo"
+    with mock.patch.object(SingletonModel, "save") as save:
+        settings.save()
+    save.assert_called_once_with()
+
+
+def test_save_deleted_row_saves_all_fields():
+    settings = loaded_settings()
+    settings.site_name = "foo"
+    with mock.patch.object(
+        SingletonModel,
+        "save",
+        side_effect=[
+            DatabaseError("Save with update_fields did not affect any rows."),
+            None,
+        ],
+    ) as save, mock.patch.object(ExampleSettings, "_row_exists", return_value=False):
+        settings.save()
+    assert save.call_args_list == [
+        mock.call(update_fields=["site_name"]),
+        mock.call(),
+    ]
+
+
+def test_save_reraises_other_database_errors():
+    settings = loaded_settings()
+    settings.site_name = "foo"
+    with mock.patch.object(
+        SingletonModel, "save", side_effect=DatabaseError
+    ) as save, mock.patch.object(ExampleSettings, "_row_exists", return_value=True):
+        with pytest.raises(DatabaseError):
+            settings.save()
+    save.assert_called_once_with(update_fields=["site_name"])
+
+
+def test_get_instance_cached():
+    settings = loaded_settings()
+    with mock.patch("conjunto.models.cache") as cache, mock.patch.object(
+        ExampleSettings, "_get_instance_from_db", return_value=settings
+    ):
+        cache.get.return_value = None
+        assert ExampleSettings.get_instance() is settings
+    cache.set.assert_called_once_with(
+        ExampleSettings._cache_key(), settings, ExampleSettings.cache_timeout
+    )
+
+
+def test_get_instance_without_caching():
+    settings = loaded_settings()
+    with mock.patch("conjunto.models.cache") as cache, mock.patch.object(
+        ExampleSettings, "_get_instance_from_db", return_value=settings
+    ), mock.patch.object(ExampleSettings, "cache_timeout", 0):
+        assert ExampleSettings.get_instance() is settings
+    cache.get.assert_not_called()
+    cache.set.assert_not_called()
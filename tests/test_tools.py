@@ -1,6 +1,6 @@
 import pytest
 
-from conjunto.tools import create_groups_permissions
+from conjunto.tools import create_groups_permissions, merge_groups_permissions
 
 groups_permissions = {
     "Site tester": {
@@ -33,3 +33,20 @@ def test_add_permissions_to_nonexisting_model():
         create_groups_permissions(
             {"group3": {"common.XYZ_does_not_exist": ["view", "add", "change"]}}
         )
+
+
+def test_merge_groups_permissions():
+    merged = merge_groups_permissions(
+        {"group1": {"core.User": ["view", "add"]}},
+        {
+            "group1": {"core.User": ["add", "change"], "core.PrivacyPage": ["view"]},
+            "group2": {"core.User": ["view"]},
+        },
+    )
+    assert merged == {
+        "group1": {
+            "core.User": ["view", "add", "change"],
+            "core.PrivacyPage": ["view"],
+        },
+        "group2": {"core.User": ["view"]},
+    }